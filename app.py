@@ -1,5 +1,6 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, get_flashed_messages
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import os
 import json
@@ -11,6 +12,11 @@ from dotenv import load_dotenv
 from wtforms import Form, StringField, TextAreaField, validators
 import uuid
 import base64
+import hashlib
+import sqlite3
+import stat
+import tempfile
+import threading
 from io import BytesIO
 
 # Load environment variables
@@ -59,6 +65,104 @@ except ImportError:
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 sia = SentimentIntensityAnalyzer()
 
+# TextBlob loads its sentiment lexicon lazily on first use; warm it up here so that
+# with `gunicorn --preload` it is loaded once in the master and shared by all workers
+try:
+    TextBlob("warm up").sentiment
+except Exception as e:
+    print(f"⚠️  Could not preload TextBlob data: {e}")
+
+# Shared sentiment cache - a SQLite file in shared memory that every worker can read
+def _default_nlp_cache_path():
+    """Cache file in a private (0700) directory named by user and app location, so other
+    local users can't plant results in it and separate app instances don't share it"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    app_id = hashlib.sha256(app.root_path.encode('utf-8')).hexdigest()[:12]
+    owner = os.getuid() if hasattr(os, 'getuid') else 'user'
+    cache_dir = os.path.join(base, f'ai_journal_{owner}_{app_id}')
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    return os.path.join(cache_dir, 'nlp_cache.db')
+
+def _nlp_cache_trusted(path):
+    """Only trust a cache file owned by us that nobody else can write to or replace"""
+    if not hasattr(os, 'getuid'):
+        return True
+    cache_dir = os.path.dirname(os.path.abspath(path))
+    dir_stat = os.stat(cache_dir)
+    # Others may only write to the directory if the sticky bit stops them replacing our file
+    if not dir_stat.st_mode & stat.S_ISVTX and (
+            dir_stat.st_uid != os.getuid() or dir_stat.st_mode & 0o022):
+        return False
+    file_stat = os.lstat(path)
+    return file_stat.st_uid == os.getuid() and not file_stat.st_mode & 0o022
+
+NLP_CACHE_ENABLED = os.getenv('NLP_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+NLP_CACHE_PATH = os.getenv('NLP_CACHE_PATH')
+if NLP_CACHE_ENABLED and not NLP_CACHE_PATH:
+    try:
+        NLP_CACHE_PATH = _default_nlp_cache_path()
+    except OSError as e:
+        print(f"⚠️  Could not create the sentiment cache directory: {e}")
+        NLP_CACHE_ENABLED = False
+NLP_CACHE_MAX_ROWS = int(os.getenv('NLP_CACHE_MAX_ROWS', 10000))
+# Bump whenever analyze_sentiment's scoring changes so old results are no longer served
+SENTIMENT_VERSION = 1
+
+_nlp_cache_conn = None
+_nlp_cache_pid = None
+_nlp_cache_lock = threading.Lock()
+
+def _nlp_cache_connection():
+    """Return this worker's connection to the shared sentiment cache.
+    Opened lazily and per process, so a connection is never inherited across fork."""
+    global _nlp_cache_conn, _nlp_cache_pid, NLP_CACHE_ENABLED
+    if _nlp_cache_pid != os.getpid():
+        try:
+            # Create the file ourselves so it is private to this user
+            os.close(os.open(NLP_CACHE_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        except FileExistsError:
+            pass
+        if not _nlp_cache_trusted(NLP_CACHE_PATH):
+            print(f"⚠️  Not using sentiment cache {NLP_CACHE_PATH}: it is owned or writable by another user")
+            NLP_CACHE_ENABLED = False
+            raise sqlite3.DatabaseError('untrusted sentiment cache')
+        conn = sqlite3.connect(NLP_CACHE_PATH, timeout=1, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS sentiment (key TEXT PRIMARY KEY, score REAL, label TEXT)')
+        _nlp_cache_conn, _nlp_cache_pid = conn, os.getpid()
+    return _nlp_cache_conn
+
+def _nlp_cache_key(text):
+    return hashlib.sha256(f"{SENTIMENT_VERSION}:{text}".encode('utf-8')).hexdigest()
+
+def get_cached_sentiment(text):
+    """Look up a sentiment result computed by any worker"""
+    if not NLP_CACHE_ENABLED:
+        return None
+    try:
+        with _nlp_cache_lock:
+            row = _nlp_cache_connection().execute(
+                'SELECT score, label FROM sentiment WHERE key = ?', (_nlp_cache_key(text),)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+    except (sqlite3.Error, OSError):
+        return None
+
+def store_cached_sentiment(text, score, label):
+    """Share a sentiment result with the other workers, dropping the oldest past the row cap"""
+    if not NLP_CACHE_ENABLED:
+        return
+    try:
+        with _nlp_cache_lock:
+            conn = _nlp_cache_connection()
+            with conn:
+                cursor = conn.execute('INSERT OR REPLACE INTO sentiment (key, score, label) VALUES (?, ?, ?)',
+                                      (_nlp_cache_key(text), score, label))
+                conn.execute('DELETE FROM sentiment WHERE rowid <= ?',
+                             (cursor.lastrowid - NLP_CACHE_MAX_ROWS,))
+    except (sqlite3.Error, OSError):
+        pass
+
 # Database Models
 class JournalEntry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -72,6 +176,11 @@ class JournalEntry(db.Model):
     word_count = db.Column(db.Integer, default=0)
     reading_time = db.Column(db.Integer, default=0)  # in minutes
 
+class SyncState(db.Model):
+    # Identifies this database to offline clients - a recreated database gets a new generation
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.String(36), nullable=False)
+
 # Forms
 class JournalEntryForm(Form):
     title = StringField('Title', [validators.Length(min=1, max=200)])
@@ -80,6 +189,10 @@ class JournalEntryForm(Form):
 # Enhanced AI Functions
 def analyze_sentiment(text):
     """Enhanced sentiment analysis using both TextBlob and VADER"""
+    cached = get_cached_sentiment(text)
+    if cached:
+        return cached
+    
     # TextBlob analysis
     blob = TextBlob(text)
     textblob_score = blob.sentiment.polarity
@@ -103,6 +216,7 @@ def analyze_sentiment(text):
     else:
         sentiment_label = 'neutral'
     
+    store_cached_sentiment(text, combined_score, sentiment_label)
     return combined_score, sentiment_label
 
 def generate_summary(text):
@@ -190,23 +304,16 @@ def dashboard():
     try:
         entries = JournalEntry.query.order_by(JournalEntry.date_created.desc()).limit(5).all()
         
-        # Calculate dashboard stats
+        # Calculate dashboard stats (dates are stored in UTC, so the month starts in UTC too)
         total_entries = JournalEntry.query.count()
-        this_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        this_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         monthly_entries = JournalEntry.query.filter(JournalEntry.date_created >= this_month).count()
         
-        # Get sentiment distribution
-        sentiment_stats = db.session.query(
-            JournalEntry.sentiment_label,
-            db.func.count(JournalEntry.id)
-        ).group_by(JournalEntry.sentiment_label).all()
-        
         return render_template('dashboard.html', 
                              entries=entries, 
                              current_user={'username': 'Guest'},
                              total_entries=total_entries,
-                             monthly_entries=monthly_entries,
-                             sentiment_stats=sentiment_stats)
+                             monthly_entries=monthly_entries)
     except Exception as e:
         # Return a simple error page for debugging
         return f"Dashboard Error: {str(e)}", 500
@@ -354,6 +461,91 @@ def analytics():
                          avg_word_count=round(avg_word_count, 1),
                          top_tags=top_tags)
 
+def get_sync_generation():
+    """Return the id offline clients use to tell whether this is the database they synced from"""
+    state = db.session.get(SyncState, 1)
+    if state is None:
+        db.session.add(SyncState(id=1, generation=str(uuid.uuid4())))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker created it first
+            db.session.rollback()
+        state = db.session.get(SyncState, 1)
+    return state.generation
+
+@app.route('/api/sync')
+def sync_entries():
+    """Return entries changed since the client's version for the offline data store.
+    Entries are only ever added and SQLite commits them in id order, so the version is
+    simply the highest entry id. This assumes SQLite: with a database that can commit
+    concurrent inserts out of id order (e.g. Postgres) a client could skip an entry."""
+    since = request.args.get('since', 0, type=int)
+    limit = max(1, min(request.args.get('limit', 500, type=int), 500))
+    
+    generation = get_sync_generation()
+    version = db.session.query(db.func.max(JournalEntry.id)).scalar() or 0
+    reset = request.args.get('generation') != generation or since > version
+    if reset:
+        # The client synced from another (e.g. recreated) database - start over
+        since = 0
+    
+    entries = JournalEntry.query.filter(JournalEntry.id > since)\
+        .order_by(JournalEntry.id).limit(limit + 1).all()
+    more = len(entries) > limit
+    entries = entries[:limit]
+    
+    return jsonify({
+        'generation': generation,
+        'version': entries[-1].id if more else version,
+        'reset': reset,
+        'more': more,
+        'entries': [{
+            'id': entry.id,
+            'title': entry.title,
+            'content': entry.content,
+            'date_created': entry.date_created.isoformat(),
+            'sentiment_score': entry.sentiment_score,
+            'sentiment_label': entry.sentiment_label,
+            'tags': json.loads(entry.tags) if entry.tags else [],
+            'word_count': entry.word_count,
+            'reading_time': entry.reading_time
+        } for entry in entries]
+    })
+
+def _asset_version():
+    """Hash of the templates and static files - changes whenever a deploy changes the pages"""
+    digest = hashlib.sha256()
+    for folder in (os.path.join(app.root_path, app.template_folder), app.static_folder):
+        for root, dirs, files in sorted(os.walk(folder)):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, app.root_path).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+ASSET_VERSION = _asset_version()
+
+@app.route('/sw.js')
+def service_worker():
+    """Serve the service worker from the site root so it controls every page.
+    Its cache is named after ASSET_VERSION, so browsers install a new worker and
+    drop their cached pages whenever a deploy changes the templates or static files."""
+    with open(os.path.join(app.static_folder, 'js', 'sw.js'), encoding='utf-8') as f:
+        script = f.read().replace('__ASSET_VERSION__', ASSET_VERSION)
+    response = app.response_class(script, mimetype='application/javascript')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.after_request
+def mark_flashed_pages(response):
+    """Tell the service worker not to cache pages that showed one-time flash messages"""
+    if request.endpoint in ('dashboard', 'search') and response.status_code == 200 and get_flashed_messages():
+        response.headers['X-Flashed-Messages'] = 'true'
+    return response
+
 # Custom Jinja filters
 @app.template_filter('from_json')
 def from_json(value):
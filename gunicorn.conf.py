@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for AI Journal
+
+Preloads app.py (and with it the VADER lexicon and TextBlob data) once in the
+master process, then forks the workers so they share those pages copy-on-write.
+Bind address and worker count still come from $PORT and $WEB_CONCURRENCY.
+Set GUNICORN_PRELOAD=false to load a separate copy of the models per worker.
+"""
+
+import gc
+import os
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+def when_ready(server):
+    """Prepare the preloaded master for forking"""
+    if not preload_app:
+        return
+
+    # Don't hand the master's database connections to the workers
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose()
+
+    # Move the loaded models out of the GC's reach so collections in the
+    # workers don't touch (and copy) the shared pages
+    gc.freeze()
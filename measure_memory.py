@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Measure memory per gunicorn worker with and without preloading the NLP models
+Linux only - reads /proc/<pid>/smaps_rollup
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+WORKERS = int(os.getenv('WEB_CONCURRENCY', 4))
+PORT = int(os.getenv('PORT', 5055))
+BOOT_TIMEOUT = 60  # seconds to wait for all workers to come up
+REQUESTS_PER_WORKER = 10  # new entries posted before sampling
+
+def get_children(pid):
+    """Return the pids of all direct children of a process"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after it
+                fields = f.read().rsplit(')', 1)[1].split()
+            if int(fields[1]) == pid:
+                children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+def read_memory(pid):
+    """Return RSS, PSS and private memory of a process in MB"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    private = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values.get('Rss', 0), values.get('Pss', 0), private
+
+def wait_until_ready(master):
+    """Wait for gunicorn to answer with all workers running; exit if it doesn't"""
+    deadline = time.time() + BOOT_TIMEOUT
+    while time.time() < deadline:
+        if master.poll() is not None:
+            print(f"❌ gunicorn exited with code {master.returncode}. Is port {PORT} free and does app.py import?")
+            sys.exit(1)
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{PORT}/test', timeout=5).read()
+            if len(get_children(master.pid)) == WORKERS:
+                return
+        except OSError:
+            pass
+        time.sleep(1)
+
+    found = len(get_children(master.pid))
+    print(f"❌ gunicorn did not start {WORKERS} workers within {BOOT_TIMEOUT}s ({found} running)")
+    master.terminate()
+    master.wait()
+    sys.exit(1)
+
+def send_traffic():
+    """Create entries and load the main pages so workers touch the shared models"""
+    for i in range(WORKERS * REQUESTS_PER_WORKER):
+        data = urllib.parse.urlencode({
+            'title': f'Measurement entry {i}',
+            'content': f'Entry {i}: today was a good day, although the morning felt a little stressful.'
+        }).encode()
+        urllib.request.urlopen(f'http://127.0.0.1:{PORT}/new_entry', data=data, timeout=30).read()
+        urllib.request.urlopen(f'http://127.0.0.1:{PORT}/search?q=good', timeout=30).read()
+        urllib.request.urlopen(f'http://127.0.0.1:{PORT}/analytics', timeout=30).read()
+
+def measure(preload):
+    """Start gunicorn, send some traffic, sample its workers and shut it down again"""
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep measurement entries and cached results out of the real database and cache
+        env = dict(
+            os.environ,
+            GUNICORN_PRELOAD='true' if preload else 'false',
+            DATABASE_URL=f'sqlite:///{os.path.join(workdir, "journal.db")}',
+            NLP_CACHE_PATH=os.path.join(workdir, 'nlp_cache.db')
+        )
+        master = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+             '-w', str(WORKERS), '-b', f'127.0.0.1:{PORT}', 'app:app'],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_ready(master)
+            send_traffic()
+            workers = get_children(master.pid)
+            if master.poll() is not None or len(workers) != WORKERS:
+                print(f"❌ Expected {WORKERS} workers after sending traffic, found {len(workers)}")
+                sys.exit(1)
+            samples = [read_memory(pid) for pid in workers]
+            return read_memory(master.pid), samples
+        finally:
+            master.terminate()
+            master.wait()
+
+def print_report(label, master, samples):
+    """Print memory usage for one run"""
+    print(f"\n{label}")
+    print("-" * 50)
+    print(f"{'process':<12}{'RSS MB':>12}{'PSS MB':>12}{'Private MB':>14}")
+    print(f"{'master':<12}{master[0]:>12.1f}{master[1]:>12.1f}{master[2]:>14.1f}")
+    for i, (rss, pss, private) in enumerate(samples, 1):
+        print(f"{'worker ' + str(i):<12}{rss:>12.1f}{pss:>12.1f}{private:>14.1f}")
+    avg_pss = sum(s[1] for s in samples) / len(samples)
+    avg_private = sum(s[2] for s in samples) / len(samples)
+    print(f"{'avg worker':<12}{'':>12}{avg_pss:>12.1f}{avg_private:>14.1f}")
+    total = master[1] + sum(s[1] for s in samples)
+    print(f"Total PSS (master + {len(samples)} workers): {total:.1f} MB")
+
+def main():
+    """Compare memory per worker before and after preloading"""
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("❌ /proc/<pid>/smaps_rollup not available. Run this on Linux.")
+        sys.exit(1)
+
+    print("AI Journal Memory per Worker")
+    print("=" * 50)
+    print(f"Starting {WORKERS} workers on port {PORT}, "
+          f"sending {WORKERS * REQUESTS_PER_WORKER} new entries per run...")
+
+    master, samples = measure(preload=False)
+    print_report("Before: each worker loads its own models (GUNICORN_PRELOAD=false)", master, samples)
+
+    master, samples = measure(preload=True)
+    print_report("After: models loaded once in the master (GUNICORN_PRELOAD=true)", master, samples)
+
+    print("\nPSS splits shared pages between the processes using them, so the")
+    print("average worker PSS is the real cost of adding one more worker.")
+
+if __name__ == "__main__":
+    main()
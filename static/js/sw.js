@@ -0,0 +1,113 @@
+// AI Journal Service Worker
+//
+// Serves the dashboard and search pages from cache so repeat visits are instant,
+// never reach the server and work offline. The entries on those pages are rendered
+// from IndexedDB by sync.js, which only fetches what changed from /api/sync.
+//
+// app.py fills in __ASSET_VERSION__ with a hash of the templates and static files,
+// so a deploy that changes them installs a new worker with a fresh cache.
+
+const CACHE_NAME = 'ai-journal-__ASSET_VERSION__';
+const SHELL_PAGES = ['/dashboard', '/search'];
+const STATIC_ASSETS = [
+    '/static/css/style.css',
+    '/static/js/app.js',
+    '/static/js/sync.js'
+];
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(STATIC_ASSETS))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key !== CACHE_NAME).map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+
+    // Writes (e.g. a new entry) pass straight through; drop the cached pages so
+    // the next visit picks up the server's flash message
+    if (request.method !== 'GET') {
+        event.waitUntil(clearShellPages());
+        return;
+    }
+
+    // Sync data is managed by sync.js, never cache it here
+    if (url.origin === self.location.origin && url.pathname.startsWith('/api/')) {
+        return;
+    }
+
+    if (request.mode === 'navigate') {
+        const isShellPage = url.origin === self.location.origin && SHELL_PAGES.includes(url.pathname);
+        if (isShellPage && !url.search) {
+            event.respondWith(shellPage(event, url.pathname));
+        } else if (isShellPage) {
+            // Filtered search results come from the server; offline, fall back to the
+            // cached page and let sync.js filter the local entries
+            event.respondWith(networkFirst(request, url.pathname));
+        } else {
+            event.respondWith(networkFirst(request, '/dashboard'));
+        }
+        return;
+    }
+
+    // Static files only change with a new asset version (and cache); CDN files are versioned
+    if (url.pathname.startsWith('/static/') || url.origin !== self.location.origin) {
+        event.respondWith(cacheFirst(request));
+    }
+});
+
+async function shellPage(event, path) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(path);
+    if (cached) {
+        return cached;
+    }
+
+    const response = await fetch(event.request);
+    // Pages showing a one-time flash message must not be served again
+    if (response.ok && !response.redirected && !response.headers.has('X-Flashed-Messages')) {
+        event.waitUntil(cache.put(path, response.clone()));
+    }
+    return response;
+}
+
+async function networkFirst(request, fallbackPath) {
+    try {
+        return await fetch(request);
+    } catch (error) {
+        const cache = await caches.open(CACHE_NAME);
+        return (await cache.match(request)) || (await cache.match(fallbackPath)) || Response.error();
+    }
+}
+
+async function cacheFirst(request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    if (cached) {
+        return cached;
+    }
+
+    const response = await fetch(request);
+    if (response.ok || response.type === 'opaque') {
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function clearShellPages() {
+    const cache = await caches.open(CACHE_NAME);
+    await Promise.all(SHELL_PAGES.map(path => cache.delete(path)));
+}
@@ -0,0 +1,305 @@
+// AI Journal Offline Data Store
+//
+// Keeps a copy of the journal entries in IndexedDB and fetches only the entries
+// added since the last sync from /api/sync. If the server's database is not the
+// one we synced from (its generation changed) the local copy is replaced. The
+// dashboard and search pages are rendered from this local copy.
+
+const SYNC_DB_NAME = 'ai-journal';
+const SYNC_DB_VERSION = 1;
+const MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+const SENTIMENT_BADGES = {
+    positive: 'success',
+    slightly_positive: 'warning',
+    neutral: 'secondary',
+    slightly_negative: 'info',
+    negative: 'danger'
+};
+
+// Register the service worker
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(error => {
+            console.log('Service worker registration failed:', error);
+        });
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const onDashboard = document.getElementById('recent-entries');
+    const onSearch = document.getElementById('search-results');
+    if (!('indexedDB' in window) || (!onDashboard && !onSearch)) {
+        return;
+    }
+
+    function render(entries) {
+        if (onDashboard) {
+            renderDashboard(entries);
+        } else {
+            renderSearch(entries);
+        }
+    }
+
+    // Render what we already have, then fetch whatever changed
+    loadEntries().then(entries => {
+        if (entries.length) {
+            render(entries);
+        }
+        return syncEntries().then(changed => {
+            if (changed) {
+                return loadEntries().then(render);
+            }
+        });
+    }).catch(error => {
+        console.log('Offline data store unavailable:', error);
+    });
+});
+
+// IndexedDB helpers
+function openDatabase() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(SYNC_DB_NAME, SYNC_DB_VERSION);
+        request.onupgradeneeded = function() {
+            const db = request.result;
+            db.createObjectStore('entries', { keyPath: 'id' });
+            db.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+function loadEntries() {
+    return openDatabase().then(db => new Promise((resolve, reject) => {
+        const request = db.transaction('entries').objectStore('entries').getAll();
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    }));
+}
+
+function getSyncState(db) {
+    return new Promise((resolve, reject) => {
+        const store = db.transaction('meta').objectStore('meta');
+        const version = store.get('version');
+        const generation = store.get('generation');
+        generation.onsuccess = () => resolve({
+            version: version.result || 0,
+            generation: generation.result || ''
+        });
+        generation.onerror = () => reject(generation.error);
+    });
+}
+
+function saveChanges(db, data) {
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(['entries', 'meta'], 'readwrite');
+        const store = tx.objectStore('entries');
+        if (data.reset) {
+            store.clear();
+        }
+        data.entries.forEach(entry => store.put(entry));
+        tx.objectStore('meta').put(data.version, 'version');
+        tx.objectStore('meta').put(data.generation, 'generation');
+        tx.oncomplete = () => resolve();
+        tx.onerror = () => reject(tx.error);
+    });
+}
+
+// Fetch entries added since the stored version; resolves to true if anything changed
+function syncEntries() {
+    return openDatabase().then(db => {
+        let changed = false;
+
+        function fetchPage() {
+            return getSyncState(db).then(state =>
+                fetch(`/api/sync?since=${state.version}&generation=${encodeURIComponent(state.generation)}`,
+                      { credentials: 'same-origin' })
+            ).then(response => {
+                if (!response.ok) {
+                    throw new Error(`Sync failed with status ${response.status}`);
+                }
+                return response.json();
+            }).then(data => {
+                changed = changed || data.reset || data.entries.length > 0;
+                return saveChanges(db, data).then(() => data.more ? fetchPage() : changed);
+            });
+        }
+
+        return fetchPage();
+    }).catch(error => {
+        // Offline - keep using the local copy
+        console.log('Sync skipped:', error);
+        return false;
+    });
+}
+
+// Same stats as the /dashboard route; entry dates are UTC, so is the current month
+function getStats(entries) {
+    const thisMonth = new Date().toISOString().slice(0, 7);
+    return {
+        total_entries: entries.length,
+        monthly_entries: entries.filter(entry => entry.date_created.slice(0, 7) === thisMonth).length
+    };
+}
+
+// Same filters as the /search route
+function filterEntries(entries, params) {
+    const query = (params.get('q') || '').toLowerCase();
+    const emotion = params.get('emotion') || '';
+    const date = params.get('date') || '';
+    const tag = params.get('tag') || '';
+
+    return entries.filter(entry => {
+        if (query && !entry.title.toLowerCase().includes(query) && !entry.content.toLowerCase().includes(query)) {
+            return false;
+        }
+        if (emotion && entry.sentiment_label !== emotion) {
+            return false;
+        }
+        if (date && entry.date_created.slice(0, 10) !== date) {
+            return false;
+        }
+        if (tag && !entry.tags.some(entryTag => entryTag.includes(tag))) {
+            return false;
+        }
+        return true;
+    });
+}
+
+// Rendering
+function newestFirst(entries) {
+    return entries.slice().sort((a, b) => b.date_created.localeCompare(a.date_created));
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function formatDate(isoDate) {
+    const [year, month, day] = isoDate.slice(0, 10).split('-');
+    return `${MONTH_NAMES[parseInt(month, 10) - 1]} ${day}, ${year}`;
+}
+
+function formatLabel(label) {
+    return label.split('_').map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' ');
+}
+
+function renderEntryCard(entry, excerptLength) {
+    const excerpt = entry.content.slice(0, excerptLength) + (entry.content.length > excerptLength ? '...' : '');
+    const tags = entry.tags.length ? `
+        <div class="mb-2">
+            ${entry.tags.map(tag => `<span class="badge bg-light text-dark me-1">${escapeHtml(tag)}</span>`).join('')}
+        </div>` : '';
+    const readingTime = entry.word_count ? `
+        <br><i class="fas fa-clock me-1"></i>
+        ${entry.reading_time} min read` : '';
+
+    return `
+        <div class="col-md-6 col-lg-4">
+            <div class="entry-card card h-100">
+                <div class="card-body">
+                    <div class="d-flex justify-content-between align-items-start mb-2">
+                        <h6 class="card-title mb-0">${escapeHtml(entry.title)}</h6>
+                        <span class="badge bg-${SENTIMENT_BADGES[entry.sentiment_label] || 'danger'}">
+                            ${formatLabel(entry.sentiment_label)}
+                        </span>
+                    </div>
+                    <p class="card-text text-muted small">${escapeHtml(excerpt)}</p>
+                    ${tags}
+                    <div class="d-flex justify-content-between align-items-center">
+                        <small class="text-muted">
+                            <i class="fas fa-calendar me-1"></i>
+                            ${formatDate(entry.date_created)}
+                            ${readingTime}
+                        </small>
+                        <a href="/entry/${entry.id}" class="btn btn-sm btn-outline-primary">
+                            <i class="fas fa-eye me-1"></i>View
+                        </a>
+                    </div>
+                </div>
+            </div>
+        </div>`;
+}
+
+function renderDashboard(entries) {
+    const stats = getStats(entries);
+    document.getElementById('stat-total-entries').textContent = stats.total_entries;
+    document.getElementById('stat-monthly-entries').textContent = stats.monthly_entries;
+
+    if (entries.length) {
+        document.getElementById('recent-entries').innerHTML = `
+            <div class="row g-3">
+                ${newestFirst(entries).slice(0, 5).map(entry => renderEntryCard(entry, 100)).join('')}
+            </div>`;
+    } else {
+        document.getElementById('recent-entries').innerHTML = `
+            <div class="text-center py-5">
+                <i class="fas fa-book-open fa-3x text-muted mb-3"></i>
+                <h5 class="text-muted">No entries yet</h5>
+                <p class="text-muted">Start your journaling journey by creating your first entry!</p>
+                <a href="/new_entry" class="btn btn-primary">
+                    <i class="fas fa-plus me-2"></i>Create First Entry
+                </a>
+            </div>`;
+    }
+}
+
+function renderSearch(entries) {
+    const params = new URLSearchParams(window.location.search);
+    const results = newestFirst(filterEntries(entries, params));
+    const hasFilters = ['q', 'emotion', 'date', 'tag'].some(name => params.get(name));
+
+    // The page may come from the service worker cache, so restore the form from the URL
+    ['q', 'emotion', 'date'].forEach(name => {
+        const field = document.getElementById(name);
+        if (field) {
+            field.value = params.get(name) || '';
+        }
+    });
+
+    const allTags = Array.from(new Set([].concat(...entries.map(entry => entry.tags)))).sort();
+    const tagSelect = document.getElementById('tag');
+    if (tagSelect) {
+        const selected = params.get('tag') || '';
+        tagSelect.innerHTML = '<option value="">All Tags</option>' + allTags.map(tag =>
+            `<option value="${escapeHtml(tag)}"${tag === selected ? ' selected' : ''}>${escapeHtml(tag)}</option>`
+        ).join('');
+    }
+
+    const popularTags = document.getElementById('popular-tags');
+    if (popularTags) {
+        popularTags.innerHTML = allTags.slice(0, 20).map(tag =>
+            `<a href="/search?tag=${encodeURIComponent(tag)}" class="badge bg-light text-dark text-decoration-none">${escapeHtml(tag)}</a>`
+        ).join('');
+    }
+
+    document.getElementById('search-count').textContent = `${results.length} entries found`;
+
+    if (results.length) {
+        document.getElementById('search-results').innerHTML = `
+            <div class="row g-4">
+                ${results.map(entry => renderEntryCard(entry, 120)).join('')}
+            </div>`;
+    } else {
+        document.getElementById('search-results').innerHTML = `
+            <div class="text-center py-5">
+                <i class="fas fa-search fa-3x text-muted mb-3"></i>
+                <h5 class="text-muted">No entries found</h5>
+                <p class="text-muted">
+                    ${hasFilters ?
+                        'Try adjusting your search criteria or <a href="/search">clear all filters</a>' :
+                        'No journal entries yet. <a href="/new_entry">Create your first entry</a>'}
+                </p>
+            </div>`;
+    }
+}
+
+// Export functions for use in other scripts
+window.AIJournalSync = {
+    syncEntries,
+    loadEntries,
+    getStats,
+    filterEntries
+};
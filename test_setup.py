@@ -3,7 +3,11 @@
 Test script to verify AI Journal setup
 """
 
+import os
+import shutil
+import sqlite3
 import sys
+import tempfile
 import importlib
 
 def test_imports():
@@ -82,11 +86,113 @@ def test_ai_functions():
         print(f"✗ AI functions test failed: {e}")
         return False
 
+def test_sentiment_cache():
+    """Test the shared sentiment cache"""
+    print("\nTesting sentiment cache...")
+    try:
+        import app
+    except Exception as e:
+        print(f"✗ Sentiment cache test failed: {e}")
+        return False
+    saved = (app.NLP_CACHE_ENABLED, app.NLP_CACHE_MAX_ROWS, app.SENTIMENT_VERSION)
+    try:
+        text = "Sentiment cache test: a calm and happy afternoon."
+        
+        # A second call returns the stored result instead of scoring again
+        app.analyze_sentiment(text)
+        app.store_cached_sentiment(text, 0.99, 'cached')
+        assert app.analyze_sentiment(text) == (0.99, 'cached')
+        print("✓ Repeated text is served from the cache")
+        
+        # Results from another scoring version are not served
+        app.SENTIMENT_VERSION += 1
+        assert app.get_cached_sentiment(text) is None
+        app.SENTIMENT_VERSION = saved[2]
+        print("✓ Changing SENTIMENT_VERSION misses the cache")
+        
+        # Only the newest NLP_CACHE_MAX_ROWS results are kept
+        app.NLP_CACHE_MAX_ROWS = 3
+        for i in range(5):
+            app.store_cached_sentiment(f"eviction test {i}", 0.0, 'neutral')
+        rows = sqlite3.connect(app.NLP_CACHE_PATH).execute('SELECT COUNT(*) FROM sentiment').fetchone()[0]
+        assert rows == 3, rows
+        assert app.get_cached_sentiment("eviction test 1") is None
+        assert app.get_cached_sentiment("eviction test 4") is not None
+        print("✓ Oldest results are evicted past NLP_CACHE_MAX_ROWS")
+        
+        # With the cache disabled, results are neither read nor stored
+        app.NLP_CACHE_ENABLED = False
+        assert app.analyze_sentiment("eviction test 4") != (0.0, 'neutral')
+        app.store_cached_sentiment("disabled test", 0.5, 'cached')
+        app.NLP_CACHE_ENABLED = True
+        assert app.get_cached_sentiment("disabled test") is None
+        print("✓ NLP_CACHE_ENABLED=false bypasses the cache")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Sentiment cache test failed: {e!r}")
+        return False
+    finally:
+        app.NLP_CACHE_ENABLED, app.NLP_CACHE_MAX_ROWS, app.SENTIMENT_VERSION = saved
+
+def test_sync_api():
+    """Test the offline sync endpoint (main() points DATABASE_URL at a throwaway database)"""
+    print("\nTesting sync API...")
+    entry_ids = []
+    try:
+        from app import app, db, JournalEntry, get_sync_generation
+        
+        with app.app_context():
+            # Add a few entries to page through
+            for i in range(3):
+                entry = JournalEntry(title=f'Sync test {i}', content='Sync test entry')
+                db.session.add(entry)
+                db.session.commit()
+                entry_ids.append(entry.id)
+            generation = get_sync_generation()
+        
+        client = app.test_client()
+        since = entry_ids[0] - 1
+        
+        # Paging: one entry per page, the version advances to the last entry sent
+        first = client.get(f'/api/sync?since={since}&generation={generation}&limit=1').get_json()
+        assert [e['id'] for e in first['entries']] == entry_ids[:1], first
+        assert first['more'] and first['version'] == entry_ids[0] and not first['reset']
+        rest = client.get(f"/api/sync?since={first['version']}&generation={generation}").get_json()
+        assert [e['id'] for e in rest['entries']] == entry_ids[1:], rest
+        assert not rest['more'] and rest['version'] == entry_ids[-1]
+        print("✓ Paging with limit and more")
+        
+        # Bad limits are clamped instead of failing
+        for limit in (0, -1):
+            response = client.get(f'/api/sync?since={since}&generation={generation}&limit={limit}')
+            assert response.status_code == 200, response.status_code
+            assert len(response.get_json()['entries']) == 1
+        print("✓ Invalid limit values")
+        
+        # A client ahead of the server, or synced from another database, starts over
+        ahead = client.get(f"/api/sync?since={rest['version'] + 1000}&generation={generation}").get_json()
+        assert ahead['reset'] and ahead['entries'] and ahead['entries'][0]['id'] <= entry_ids[0]
+        other = client.get(f"/api/sync?since={rest['version']}&generation=other-database").get_json()
+        assert other['reset'] and other['generation'] == generation
+        print("✓ Reset when since is ahead of the version or the generation differs")
+        
+        return True
+    except Exception as e:
+        print(f"✗ Sync API test failed: {e!r}")
+        return False
+
 def main():
     """Run all tests"""
     print("AI Journal Setup Test")
     print("=" * 50)
     
+    # Keep test data out of the real database and sentiment cache
+    test_dir = tempfile.mkdtemp(prefix='ai_journal_test_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(test_dir, 'journal.db')}"
+    os.environ['NLP_CACHE_PATH'] = os.path.join(test_dir, 'nlp_cache.db')
+    os.environ['NLP_CACHE_ENABLED'] = 'true'
+    
     # Test imports
     failed_imports = test_imports()
     
@@ -99,12 +205,20 @@ def main():
     # Test AI functions
     ai_ok = test_ai_functions()
     
+    # Test sentiment cache
+    cache_ok = test_sentiment_cache()
+    
+    # Test sync API
+    sync_ok = test_sync_api()
+    
+    shutil.rmtree(test_dir, ignore_errors=True)
+    
     # Summary
     print("\n" + "=" * 50)
     print("TEST SUMMARY")
     print("=" * 50)
     
-    if not failed_imports and nltk_ok and flask_ok and ai_ok:
+    if not failed_imports and nltk_ok and flask_ok and ai_ok and cache_ok and sync_ok:
         print("🎉 All tests passed! Your AI Journal is ready to run.")
         print("\nTo start the application:")
         print("  python app.py")
@@ -126,6 +240,12 @@ def main():
         if not ai_ok:
             print("\nAI functions failed. This might be due to missing API keys.")
             print("Check your .env file configuration.")
+        
+        if not cache_ok:
+            print("\nSentiment cache failed. Check NLP_CACHE_PATH is writable.")
+        
+        if not sync_ok:
+            print("\nSync API failed. Check the /api/sync route in app.py.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file